@@ -34,40 +34,80 @@
 
 
 import sys, os
+import io
 import struct
+import mmap
 
 IS_PY2 = sys.version_info[0] == 2
+HAS_PREAD = hasattr(os, 'pread')
 
 MAX_INT = 2 ** (struct.Struct('i').size * 8 - 1) - 1
 HEADER_SIZE = 1024 * 32
 SECTOR_SIZE = 1024 * 2 # FIXME: This should not be hard coded
 
 
+# Precompiled little endian unpackers (UDF is little endian)
+_U8 = struct.Struct('<B')
+_U16LE = struct.Struct('<H')
+_U32LE = struct.Struct('<I')
+_U64LE = struct.Struct('<Q')
+_unpack_u8 = _U8.unpack_from
+_unpack_u16 = _U16LE.unpack_from
+_unpack_u32 = _U32LE.unpack_from
+_unpack_u64 = _U64LE.unpack_from
+
+# The 16 byte header of every Descriptor Tag
+_TAG_HDR = struct.Struct('<HHBBHHHI')
+
+# The tag header bytes that are summed into its checksum (all but byte 4)
+_TAG_CHECKSUM_BYTES = struct.Struct('<4Bx11B')
+
+# The small fixed layout structures
+_EXTENT_AD = struct.Struct('<II')
+_LB_ADDR = struct.Struct('<IH')
+_TYPE1_PARTITION_MAP = struct.Struct('<BBHH')
+
+# The integer fields of the descriptors, with the bytes between them skipped
+_FSD_FIELDS = struct.Struct('<HHIIII') # at byte 28
+_PVD_FIELDS = struct.Struct('<II32xHHHHII412xIH') # at byte 16
+_PD_FIELDS = struct.Struct('<IHH160xIII') # at byte 16
+_LVD_FIELDS = struct.Struct('<I192xI48xII') # at byte 16
+_FE_FIELDS = struct.Struct('<IIIHBBIQQ36xI48xQI') # at byte 36
+_FID_FIELDS = struct.Struct('<HBB16xH') # at byte 16
+
+# The domain identifier of every OSTA UDF logical volume
+_OSTA_UDF_COMPLIANT = b"*OSTA UDF Compliant"
+
+# Runs of zero bytes that reserved space is compared against, by length
+_ZERO_RUNS = {}
+
+# Standard identifiers of the Volume Recognition Sequence
+_VSD_IDENTIFIERS = frozenset([b'NSR02', b'NSR03'])
+_OTHER_VRS_IDENTIFIERS = frozenset([b'BOOT2', b'CD001', b'CDW02'])
+
+
 def to_uint8(buffer, start = 0):
-	return struct.unpack('B', buffer[start : start + 1])[0]
+	return _unpack_u8(buffer, start)[0]
 
 def to_uint16(buffer, start = 0):
-	left = ((to_uint8(buffer, start + 1) << 8) & 0xFF00)
-	right = ((to_uint8(buffer, start + 0) << 0) & 0x00FF)
-	return (left | right)
+	return _unpack_u16(buffer, start)[0]
 
 def to_uint32(buffer, start = 0):
-	a = ((to_uint8(buffer, start + 3) << 24) & 0xFF000000)
-	b = ((to_uint8(buffer, start + 2) << 16) & 0x00FF0000)
-	c = ((to_uint8(buffer, start + 1) << 8) & 0x0000FF00)
-	d = ((to_uint8(buffer, start + 0) << 0) & 0x000000FF)
-	return(a | b | c | d)
+	return _unpack_u32(buffer, start)[0]
 
 def to_uint64(buffer, start = 0):
-	a = ((to_uint8(buffer, start + 7) << 56) & 0xFF00000000000000)
-	b = ((to_uint8(buffer, start + 6) << 48) & 0x00FF000000000000)
-	c = ((to_uint8(buffer, start + 5) << 40) & 0x0000FF0000000000)
-	d = ((to_uint8(buffer, start + 4) << 32) & 0x000000FF00000000)
-	e = ((to_uint8(buffer, start + 3) << 24) & 0x00000000FF000000)
-	f = ((to_uint8(buffer, start + 2) << 16) & 0x0000000000FF0000)
-	g = ((to_uint8(buffer, start + 1) << 8) & 0x000000000000FF00)
-	h = ((to_uint8(buffer, start + 0) << 0) & 0x00000000000000FF)
-	return(a | b | c | d | e | f | g | h)
+	return _unpack_u64(buffer, start)[0]
+
+# The checksum of a Descriptor Tag, the sum of its bytes except byte 4 truncated to uint8
+def tag_checksum(buffer, start = 0):
+	return sum(_TAG_CHECKSUM_BYTES.unpack_from(buffer, start)) & 0xFF
+
+# Copy a buffer to bytes, as bytes() of a memoryview does not copy it on Python 2
+def to_bytes(buffer):
+	if isinstance(buffer, memoryview):
+		return buffer.tobytes()
+
+	return bytes(buffer)
 
 def round_up(value, unit):
 	return ((value + (unit - 1)) // unit) * unit
@@ -83,13 +123,21 @@ def to_dchars(buffer, offset, count):
 	alg = to_uint8(buffer, offset)
 
 	if alg not in [8, 16]:
-		raise Exception("Corrupt compressed unicode string")
+		raise UdfFormatError("Corrupt compressed unicode string")
+
+	# 8 bit characters are the code points 0 to 255, so convert them in one go
+	if alg == 8:
+		chars = buffer[offset + 1 : offset + count]
+		if IS_PY2:
+			return chars
+		else:
+			return bytes(chars).decode('latin-1').encode('utf-8')
 
 	result = []
 
 	pos = 1
 	while pos < count:
-		ch = to_uint8(b"\0")
+		ch = 0
 
 		if alg == 16:
 			ch = (to_uint8(buffer, offset + pos) << 8)
@@ -109,55 +157,99 @@ def to_dchars(buffer, offset, count):
 
 	return b''.join(result)
 
+# Memory map the file, so reading from it is just slicing memory
+# Falls back to the file itself if it can not be mapped
+def map_file(file, file_size):
+	if file_size == 0:
+		return file
+
+	try:
+		mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+	except (EnvironmentError, ValueError, OverflowError):
+		return file
+
+	# The map has its own file descriptor, so the file is not needed anymore
+	file.close()
+	return mapped
+
+# Read from an offset without moving the file position
+def read_at(file, offset, size):
+	if isinstance(file, mmap.mmap):
+		return file[offset : offset + size]
+
+	# Only use pread if the file has a real file descriptor
+	if HAS_PREAD:
+		try:
+			fd = file.fileno()
+		except (AttributeError, io.UnsupportedOperation):
+			fd = None
+
+		if fd is not None:
+			return os.pread(fd, size, offset)
+
+	file.seek(offset)
+	return file.read(size)
+
+
+# Raised when a structure does not match the UDF format
+# The message is only formatted when it is shown
+class UdfFormatError(Exception):
+	def __str__(self):
+		# Use the normal message, unless there is a format string and values for it
+		if len(self.args) < 2 or not isinstance(self.args[0], str):
+			return super(UdfFormatError, self).__str__()
+
+		return self.args[0].format(*self.args[1:])
+
+
+class UdfChecksumError(UdfFormatError):
+	def __init__(self, checksum, expected_checksum):
+		super(UdfChecksumError, self).__init__("Checksum was {0}, but {1} was expected", checksum, expected_checksum)
+		self.checksum = checksum
+		self.expected_checksum = expected_checksum
+
+	# The args include the message, so rebuild from the checksums when unpickled
+	def __reduce__(self):
+		return (UdfChecksumError, (self.checksum, self.expected_checksum))
+
 
 class BaseTag(object):
+	__slots__ = ('size',)
+
 	def __init__(self, size, buffer, start):
-		self._size = size
+		self.size = size
 
 		self._assert_size(buffer, start)
 
-	def get_size(self):
-		return self._size
-	size = property(get_size)
-
 	# Make sure there is enough space
 	def _assert_size(self, buffer, start):
 		# Just return if the size is zero
-		if self._size == 0:
+		if self.size == 0:
 			return
 
-		if len(buffer) - start < self._size:
-			raise Exception("{0} requires {1} bytes, but buffer only has {2}".format(type(self), self._size, len(buffer) - start))
+		if len(buffer) - start < self.size:
+			raise UdfFormatError("{0} requires {1} bytes, but buffer only has {2}", type(self), self.size, len(buffer) - start)
 
 	# Make sure the checksums match
 	def _assert_checksum(self, buffer, start, expected_checksum):
-		checksum = 0
-		for i in range(16):
-			if i == 4:
-				continue
-
-			checksum += to_uint8(buffer, start + i)
-
-		# Truncate int to uint8
-		b = checksum
-		while checksum >= 256:
-			checksum -= 256
+		checksum = tag_checksum(buffer, start)
 
 		if not checksum == expected_checksum:
-			raise Exception("Checksum was {0}, but {1} was expected".format(checksum, expected_checksum))
+			raise UdfChecksumError(checksum, expected_checksum)
 
 	# Make sure it is the correct type of tag
 	def _assert_tag_identifier(self, expected_tag_identifier):
 		if not self.descriptor_tag.tag_identifier == expected_tag_identifier:
-			raise Exception("Expected Tag Identifier {0}, but was {1}".format(expected_tag_identifier, self.descriptor_tag.tag_identifier))
+			raise UdfFormatError("Expected Tag Identifier {0}, but was {1}", expected_tag_identifier, self.descriptor_tag.tag_identifier)
 
 	# Make sure the reserved space is all zeros
 	def _assert_reserve_space(self, buffer, start, length):
-		buf_seg = buffer[start : start + length]
-		for i in range(len(buf_seg)):
-			n = buf_seg[i : i + 1]
-			if not to_uint8(n) == 0:
-				raise Exception("Reserve space at {0} was not zero.".format(start))
+		zeros = _ZERO_RUNS.get(length)
+		if zeros is None:
+			zeros = _ZERO_RUNS[length] = b"\0" * length
+
+		if not buffer[start : start + length] == zeros:
+			raise UdfFormatError("Reserve space at {0} was not zero.", start)
 
 
 class UdfContext(object):
@@ -180,6 +272,8 @@ class EntityIdType(object): # enum
 # page 14 of http://www.osta.org/specs/pdf/udf260.pdf
 # 1/12 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 class EntityID(BaseTag):
+	__slots__ = ('entity_id_type', 'flags', 'identifier', 'identifier_suffix')
+
 	def __init__(self, entity_id_type, buffer, start):
 		super(EntityID, self).__init__(32, buffer, start)
 
@@ -211,49 +305,107 @@ class TagIdentifier(object): # enum
 	FileEntry = 261
 
 
+# Unpack and validate a Descriptor Tag in one pass, or return None if it is not valid
+# No errors are built here, so probing sectors that have no tag stays cheap
+def _unpack_descriptor_tag(buffer, start):
+	# Make sure there is enough space
+	if len(buffer) - start < 16:
+		return None
+
+	fields = _TAG_HDR.unpack_from(buffer, start)
+
+	# Make sure the identifier is known
+	if fields[0] == TagIdentifier.unknown:
+		return None
+
+	# Make sure the checksums match
+	if not tag_checksum(buffer, start) == fields[2]:
+		return None
+
+	# Make sure the reserved space is zero
+	if not fields[3] == 0:
+		return None
+
+	return fields
+
+
 # page 3/3 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 # page 20 of http://www.osta.org/specs/pdf/udf260.pdf
 class DescriptorTag(BaseTag):
+	__slots__ = ('tag_identifier', 'descriptor_version', 'tag_check_sum', 'reserved', 'tag_serial_number', 'descriptor_crc', 'descriptor_crc_length', 'tag_location')
+
 	def __init__(self, buffer, start = 0):
-		super(DescriptorTag, self).__init__(16, buffer, start)
+		fields = _unpack_descriptor_tag(buffer, start)
+		if fields is None:
+			self._raise_format_error(buffer, start)
 
-		self.tag_identifier = to_uint16(buffer, start + 0)
-		self.descriptor_version = to_uint16(buffer, start + 2)
-		self.tag_check_sum = to_uint8(buffer, start + 4)
-		self.reserved = to_uint8(buffer, start + 5)
-		self.tag_serial_number = to_uint16(buffer, start + 6)
-		self.descriptor_crc = to_uint16(buffer, start + 8)
-		self.descriptor_crc_length = to_uint16(buffer, start + 10)
-		self.tag_location = to_uint32(buffer, start + 12)
+		self._set_fields(fields)
+
+	# Find out why the tag is not valid, only once it is going to raise
+	def _raise_format_error(self, buffer, start):
+		self.size = 16
+		self._assert_size(buffer, start)
 
 		# Make sure the identifier is known
-		if self.tag_identifier == TagIdentifier.unknown:
-			raise Exception("Tag Identifier was unknown")
+		if to_uint16(buffer, start) == TagIdentifier.unknown:
+			raise UdfFormatError("Tag Identifier was unknown")
 
-		self._assert_checksum(buffer, start, self.tag_check_sum)
+		self._assert_checksum(buffer, start, to_uint8(buffer, start + 4))
 		self._assert_reserve_space(buffer, start + 5, 1)
+		raise UdfFormatError("Descriptor Tag at {0} was not valid.", start)
+
+	def _set_fields(self, fields):
+		self.size = 16
+
+		(self.tag_identifier,
+		self.descriptor_version,
+		self.tag_check_sum,
+		self.reserved,
+		self.tag_serial_number,
+		self.descriptor_crc,
+		self.descriptor_crc_length,
+		self.tag_location) = fields
+
+	# Get just the Tag Identifier, without parsing and validating the whole tag
+	@classmethod
+	def peek_tag_identifier(cls, buffer, start = 0):
+		return to_uint16(buffer, start)
+
+	# Get the Descriptor Tag, or None if there is not a valid one, without raising
+	@classmethod
+	def try_parse(cls, buffer, start = 0):
+		fields = _unpack_descriptor_tag(buffer, start)
+		if fields is None:
+			return None
+
+		tag = cls.__new__(cls)
+		tag._set_fields(fields)
+		return tag
 
 
 # page 3/3 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 class ExtentDescriptor(BaseTag):
+	__slots__ = ('extent_length', 'extent_location')
+
 	def __init__(self, buffer, start = 0):
 		super(ExtentDescriptor, self).__init__(8, buffer, start)
 
-		self.extent_length = to_uint32(buffer, start)
-		self.extent_location = to_uint32(buffer, start + 4)
+		self.extent_length, self.extent_location = _EXTENT_AD.unpack_from(buffer, start)
 
 
 # page 3/15 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 class AnchorVolumeDescriptorPointer(BaseTag):
-	def __init__(self, buffer, start = 0):
+	def __init__(self, buffer, start = 0, descriptor_tag = None):
 		super(AnchorVolumeDescriptorPointer, self).__init__(512, buffer, start)
+		mv = memoryview(buffer)
 
-		self.descriptor_tag = DescriptorTag(buffer, start)
+		# Use the Descriptor Tag if it was already parsed
+		self.descriptor_tag = descriptor_tag or DescriptorTag(buffer, start)
 		self._assert_tag_identifier(TagIdentifier.AnchorVolumeDescriptorPointer)
 
 		self.main_volume_descriptor_sequence_extent = ExtentDescriptor(buffer, start + 16)
 		self.reserve_volume_descriptor_sequence_extent = ExtentDescriptor(buffer, start + 24)
-		self.reserved = buffer[start + 32 : start + 512]
+		self.reserved = mv[start + 32 : start + 512]
 
 		self._assert_reserve_space(buffer, start + 32, 480)
 
@@ -269,10 +421,7 @@ class LogicalPartition(object):
 	def __init__(self, context, volume_descriptor):
 		self.context = context
 		self.volume_descriptor = volume_descriptor
-
-	def get_logical_block_size(self):
-		return self._volume_descriptor.logical_block_size
-	logical_block_size = property(get_logical_block_size)
+		self.logical_block_size = volume_descriptor.logical_block_size
 
 	@classmethod
 	def from_descriptor(cls, context, volume_descriptor, index):
@@ -289,94 +438,155 @@ class Type1Partition(LogicalPartition):
 		self.partition_map = partition_map
 		self.physical_partition = context.physical_partitions[partition_map.partition_number]
 
-	def get_logical_block_size(self):
-		return self.volume_descriptor.logical_block_size
-	logical_block_size = property(get_logical_block_size)
-
 
 # page 4/17 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 class FileSetDescriptor(BaseTag):
-	def __init__(self, buffer, start = 0):
+	def __init__(self, buffer, start = 0, descriptor_tag = None):
 		super(FileSetDescriptor, self).__init__(512, buffer, start)
+		mv = memoryview(buffer)
+		self._buffer = buffer
+		self._start = start
 
-		self.descriptor_tag = DescriptorTag(buffer, start)
+		# Use the Descriptor Tag if it was already parsed
+		self.descriptor_tag = descriptor_tag or DescriptorTag(buffer, start)
 		self._assert_tag_identifier(TagIdentifier.FileSetDescriptor)
 
-		self.recording_date_and_time = buffer[start + 16 : start + 28] # FIXME: timestamp
-		self.interchange_level = to_uint16(buffer, start + 28)
-		self.maximum_interchange_level = to_uint16(buffer, start + 30)
-		self.character_set_list = to_uint32(buffer, start + 32)
-		self.maximum_character_set_list = to_uint32(buffer, start + 36)
-		self.file_set_number = to_uint32(buffer, start + 40)
-		self.file_set_descriptor_number = to_uint32(buffer, start + 44)
-		self.logical_volume_identifier_character_set = buffer[start + 48 : start + 112] # FIXME: charspec
+		(self.interchange_level,
+		self.maximum_interchange_level,
+		self.character_set_list,
+		self.maximum_character_set_list,
+		self.file_set_number,
+		self.file_set_descriptor_number) = _FSD_FIELDS.unpack_from(buffer, start + 28)
+
+		self.recording_date_and_time = mv[start + 16 : start + 28] # FIXME: timestamp
+		self.logical_volume_identifier_character_set = mv[start + 48 : start + 112] # FIXME: charspec
 		self.logical_volume_identifier = to_dstring(buffer, start + 112, 128)
-		self.file_set_character_set = buffer[start + 240 : start + 274] # FIXME: charspec
+		self.file_set_character_set = mv[start + 240 : start + 274] # FIXME: charspec
 		self.file_set_identifier = to_dstring(buffer, start + 304, 32)
 		self.copyright_file_identifier = to_dstring(buffer, start + 336, 32)
 		self.abstract_file_identifier = to_dstring(buffer, start + 368, 32)
 		self.root_directory_icb = LongAllocationDescriptor(buffer, start + 400)
 		self.domain_identifier = EntityID(EntityIdType.DomainIdentifier, buffer, start + 416)
-		self.next_extent = LongAllocationDescriptor(buffer, start + 448)
-		self.system_stream_directory_icb = LongAllocationDescriptor(buffer, start + 464)
-		self.reserved = buffer[start + 480 : start + 512]
+		self.reserved = mv[start + 480 : start + 512]
+		self._next_extent = None
+		self._system_stream_directory_icb = None
 
 		self._assert_reserve_space(buffer, start + 480, 32)
 
+	# Sub structures that are only parsed when used
+	def get_next_extent(self):
+		if self._next_extent is not None:
+			return self._next_extent
+
+		self._next_extent = LongAllocationDescriptor(self._buffer, self._start + 448)
+		return self._next_extent
+	next_extent = property(get_next_extent)
+
+	def get_system_stream_directory_icb(self):
+		if self._system_stream_directory_icb is not None:
+			return self._system_stream_directory_icb
+
+		self._system_stream_directory_icb = LongAllocationDescriptor(self._buffer, self._start + 464)
+		return self._system_stream_directory_icb
+	system_stream_directory_icb = property(get_system_stream_directory_icb)
+
 
 # page 3/12 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 class PrimaryVolumeDescriptor(BaseTag):
-	def __init__(self, buffer, start = 0):
+	def __init__(self, buffer, start = 0, descriptor_tag = None):
 		super(PrimaryVolumeDescriptor, self).__init__(512, buffer, start)
+		mv = memoryview(buffer)
+		self._buffer = buffer
+		self._start = start
 
-		self.descriptor_tag = DescriptorTag(buffer, start)
+		# Use the Descriptor Tag if it was already parsed
+		self.descriptor_tag = descriptor_tag or DescriptorTag(buffer, start)
 		self._assert_tag_identifier(TagIdentifier.PrimaryVolumeDescriptor)
 
-		self.volume_descriptor_sequence_number = to_uint32(buffer, start + 16)
-		self.primary_volume_descriptor_number = to_uint32(buffer, start + 20)
+		(self.volume_descriptor_sequence_number,
+		self.primary_volume_descriptor_number,
+		self.volume_sequence_number,
+		self.maximum_volume_sequence_number,
+		self.interchange_level,
+		self.maximum_interchange_level,
+		self.character_set_list,
+		self.maximum_character_set_list,
+		self.predecessor_volume_descriptor_sequence_location,
+		self.flags) = _PVD_FIELDS.unpack_from(buffer, start + 16)
+
 		self.volume_identifier = to_dstring(buffer, start + 24, 32)
-		self.volume_sequence_number = to_uint16(buffer, start + 56)
-		self.maximum_volume_sequence_number = to_uint16(buffer, start + 58)
-		self.interchange_level = to_uint16(buffer, start + 60)
-		self.maximum_interchange_level = to_uint16(buffer, start + 62)
-		self.character_set_list = to_uint32(buffer, start + 64)
-		self.maximum_character_set_list = to_uint32(buffer, start + 68)
 		self.volume_set_identifier = to_dstring(buffer, start + 72, 128)
-		self.descriptor_character_set = buffer[start + 200 : start + 264] # FIXME: char spec
-		self.expalnatory_character_set = buffer[start + 264 : start + 328] # FIXME: char spec
-		self.volume_abstract = ExtentDescriptor(buffer, start + 328)
-		self.volume_copyright_notice = ExtentDescriptor(buffer, start + 336)
-		self.application_identifier = EntityID(EntityIdType.ApplicationIdentifier, buffer, start + 344)
-		self.recording_date_and_time = buffer[start + 376 : start + 388] # FIXME: timestamp
-		self.implementation_identifier = EntityID(EntityIdType.ImplementationIdentifier, buffer, start + 388)
-		self.implementation_use = buffer[start + 420 : start + 484]
-		self.predecessor_volume_descriptor_sequence_location = to_uint32(buffer, start + 484)
-		self.flags = to_uint16(buffer, start + 488)
-		self.reserved = buffer[start + 490 : start + 512]
+		self.descriptor_character_set = mv[start + 200 : start + 264] # FIXME: char spec
+		self.expalnatory_character_set = mv[start + 264 : start + 328] # FIXME: char spec
+		self.recording_date_and_time = mv[start + 376 : start + 388] # FIXME: timestamp
+		self.implementation_use = mv[start + 420 : start + 484]
+		self.reserved = mv[start + 490 : start + 512]
+		self._volume_abstract = None
+		self._volume_copyright_notice = None
+		self._application_identifier = None
+		self._implementation_identifier = None
 
 		self._assert_reserve_space(buffer, start + 490, 22)
 
+	# Sub structures that are only parsed when used
+	def get_volume_abstract(self):
+		if self._volume_abstract is not None:
+			return self._volume_abstract
+
+		self._volume_abstract = ExtentDescriptor(self._buffer, self._start + 328)
+		return self._volume_abstract
+	volume_abstract = property(get_volume_abstract)
+
+	def get_volume_copyright_notice(self):
+		if self._volume_copyright_notice is not None:
+			return self._volume_copyright_notice
+
+		self._volume_copyright_notice = ExtentDescriptor(self._buffer, self._start + 336)
+		return self._volume_copyright_notice
+	volume_copyright_notice = property(get_volume_copyright_notice)
+
+	def get_application_identifier(self):
+		if self._application_identifier is not None:
+			return self._application_identifier
+
+		self._application_identifier = EntityID(EntityIdType.ApplicationIdentifier, self._buffer, self._start + 344)
+		return self._application_identifier
+	application_identifier = property(get_application_identifier)
+
+	def get_implementation_identifier(self):
+		if self._implementation_identifier is not None:
+			return self._implementation_identifier
+
+		self._implementation_identifier = EntityID(EntityIdType.ImplementationIdentifier, self._buffer, self._start + 388)
+		return self._implementation_identifier
+	implementation_identifier = property(get_implementation_identifier)
+
 
 # page 3/17 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 # page 45 of http://www.osta.org/specs/pdf/udf260.pdf
 class PartitionDescriptor(BaseTag):
-	def __init__(self, buffer, start = 0):
+	def __init__(self, buffer, start = 0, descriptor_tag = None):
 		super(PartitionDescriptor, self).__init__(512, buffer, start)
+		mv = memoryview(buffer)
+		self._buffer = buffer
+		self._start = start
 
-		self.descriptor_tag = DescriptorTag(buffer, start)
+		# Use the Descriptor Tag if it was already parsed
+		self.descriptor_tag = descriptor_tag or DescriptorTag(buffer, start)
 		self._assert_tag_identifier(TagIdentifier.PartitionDescriptor)
 
-		self.volume_descriptor_sequence_number = to_uint32(buffer, start + 16)
-		self.partition_flags = to_uint16(buffer, start + 20)
-		self.partition_number = to_uint16(buffer, start + 22)
-		self.partition_contents = EntityID(EntityIdType.UDFIdentifier, buffer, start + 24)
-		self.partition_contents_use = buffer[start + 56 : start + 184]
-		self.access_type = to_uint32(buffer, start + 184)
-		self.partition_starting_location = to_uint32(buffer, start + 188)
-		self.partition_length = to_uint32(buffer, start + 192)
-		self.implementation_identifier = EntityID(EntityIdType.ImplementationIdentifier, buffer, start + 196)
-		self.implementation_use = buffer[start + 228 : start + 356]
-		self.reserved = buffer[start + 356 : start + 512]
+		(self.volume_descriptor_sequence_number,
+		self.partition_flags,
+		self.partition_number,
+		self.access_type,
+		self.partition_starting_location,
+		self.partition_length) = _PD_FIELDS.unpack_from(buffer, start + 16)
+
+		self.partition_contents_use = mv[start + 56 : start + 184]
+		self.implementation_use = mv[start + 228 : start + 356]
+		self.reserved = mv[start + 356 : start + 512]
+		self._partition_contents = None
+		self._implementation_identifier = None
 
 		# If the partition has allocated volume space
 		if self.partition_flags == 1:
@@ -384,34 +594,61 @@ class PartitionDescriptor(BaseTag):
 
 		self._assert_reserve_space(buffer, start + 356, 156)
 
+	# Sub structures that are only parsed when used
+	def get_partition_contents(self):
+		if self._partition_contents is not None:
+			return self._partition_contents
+
+		self._partition_contents = EntityID(EntityIdType.UDFIdentifier, self._buffer, self._start + 24)
+		return self._partition_contents
+	partition_contents = property(get_partition_contents)
+
+	def get_implementation_identifier(self):
+		if self._implementation_identifier is not None:
+			return self._implementation_identifier
+
+		self._implementation_identifier = EntityID(EntityIdType.ImplementationIdentifier, self._buffer, self._start + 196)
+		return self._implementation_identifier
+	implementation_identifier = property(get_implementation_identifier)
+
 
 # page 3/19 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 # page 24 of http://www.osta.org/specs/pdf/udf260.pdf
 class LogicalVolumeDescriptor(BaseTag):
-	def __init__(self, buffer, start = 0):
+	def __init__(self, buffer, start = 0, descriptor_tag = None):
 		super(LogicalVolumeDescriptor, self).__init__(512, buffer, start)
+		mv = memoryview(buffer)
+		self._buffer = buffer
+		self._start = start
 
-		self.descriptor_tag = DescriptorTag(buffer, start)
+		# Use the Descriptor Tag if it was already parsed
+		self.descriptor_tag = descriptor_tag or DescriptorTag(buffer, start)
 		self._assert_tag_identifier(TagIdentifier.LogicalVolumeDescriptor)
 
-		self.volume_descriptor_sequence_number = to_uint32(buffer, start + 16)
-		self.descriptor_character_set = buffer[start + 20 : start + 84] # FIXME: charspec
+		(self.volume_descriptor_sequence_number,
+		self.logical_block_size,
+		self.map_table_length,
+		self.number_of_partition_maps) = _LVD_FIELDS.unpack_from(buffer, start + 16)
+
+		self.descriptor_character_set = mv[start + 20 : start + 84] # FIXME: charspec
 		self.logical_volume_identifier = to_dstring(buffer, start + 84, 128)
-		self.logical_block_size = to_uint32(buffer, start + 212)
 		self.domain_identifier = EntityID(EntityIdType.DomainIdentifier, buffer, start + 216)
-		self.logical_volume_contents_use = buffer[start + 248 : start + 264]
-		self.map_table_length = to_uint32(buffer, start + 264)
-		self.number_of_partition_maps = to_uint32(buffer, start + 268)
-		self.implementation_identifier = EntityID(EntityIdType.ImplementationIdentifier, buffer, start + 272)
-		self.implementation_use = buffer[start + 304 : start + 432]
-		self.integrity_sequence_extent = ExtentDescriptor(buffer, start + 432)
-		self._raw_partition_maps = buffer[start + 440 : start + 512]
+		self.logical_volume_contents_use = mv[start + 248 : start + 264]
+		self.implementation_use = mv[start + 304 : start + 432]
+		self._raw_partition_maps = mv[start + 440 : start + 512]
+		self._partition_maps = None
+		self._file_set_descriptor_location = None
+		self._implementation_identifier = None
+		self._integrity_sequence_extent = None
 
-		if not b"*OSTA UDF Compliant" in self.domain_identifier.identifier:
-			raise Exception("Logical Volume is not OSTA compliant")
+		if not _OSTA_UDF_COMPLIANT in to_bytes(self.domain_identifier.identifier):
+			raise UdfFormatError("Logical Volume is not OSTA compliant")
 
 	# "10.6.13 Partition Maps (BP 440)" of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 	def get_partition_maps(self):
+		if self._partition_maps is not None:
+			return self._partition_maps
+
 		buffer = self._raw_partition_maps
 		retval = []
 		part_start = 0
@@ -421,22 +658,46 @@ class LogicalVolumeDescriptor(BaseTag):
 			if partition_type == 1:
 				partition = Type1PartitionMap(buffer, part_start)
 			else:
-				raise Exception("Unexpected partition type {0}".format(partition_type))
+				raise UdfFormatError("Unexpected partition type {0}", partition_type)
 
 			retval.append(partition)
 			part_start += partition.size
 
-		return retval
+		self._partition_maps = retval
+		return self._partition_maps
 	partition_maps = property(get_partition_maps)
 
 	# "2.2.4.4 byte LogicalVolumeContentsUse[16]" of http://www.osta.org/specs/pdf/udf260.pdf
 	def get_file_set_descriptor_location(self):
-		return LongAllocationDescriptor(self.logical_volume_contents_use)
+		if self._file_set_descriptor_location is not None:
+			return self._file_set_descriptor_location
+
+		self._file_set_descriptor_location = LongAllocationDescriptor(self.logical_volume_contents_use)
+		return self._file_set_descriptor_location
 	file_set_descriptor_location = property(get_file_set_descriptor_location)
 
+	# Sub structures that are only parsed when used
+	def get_implementation_identifier(self):
+		if self._implementation_identifier is not None:
+			return self._implementation_identifier
+
+		self._implementation_identifier = EntityID(EntityIdType.ImplementationIdentifier, self._buffer, self._start + 272)
+		return self._implementation_identifier
+	implementation_identifier = property(get_implementation_identifier)
+
+	def get_integrity_sequence_extent(self):
+		if self._integrity_sequence_extent is not None:
+			return self._integrity_sequence_extent
+
+		self._integrity_sequence_extent = ExtentDescriptor(self._buffer, self._start + 432)
+		return self._integrity_sequence_extent
+	integrity_sequence_extent = property(get_integrity_sequence_extent)
+
 
 # page 60 of http://www.osta.org/specs/pdf/udf260.pdf
 class LongAllocationDescriptor(BaseTag):
+	__slots__ = ('extent_length', 'extent_location', 'implementation_use')
+
 	def __init__(self, buffer, start = 0):
 		super(LongAllocationDescriptor, self).__init__(16, buffer, start)
 
@@ -447,34 +708,41 @@ class LongAllocationDescriptor(BaseTag):
 
 # page 4/3 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 class LogicalBlockAddress(BaseTag):
+	__slots__ = ('logical_block_number', 'partition_reference_number')
+
 	def __init__(self, buffer, start = 0):
 		super(LogicalBlockAddress, self).__init__(6, buffer, start)
-		self.logical_block_number = to_uint32(buffer, start + 0)
-		self.partition_reference_number = to_uint16(buffer, start + 4)
+		self.logical_block_number, self.partition_reference_number = _LB_ADDR.unpack_from(buffer, start)
 
 
 class TerminatingDescriptor(BaseTag):
-	def __init__(self, buffer, start = 0):
+	def __init__(self, buffer, start = 0, descriptor_tag = None):
 		super(TerminatingDescriptor, self).__init__(512, buffer, start)
 
+		# Use the Descriptor Tag if it was already parsed
+		self.descriptor_tag = descriptor_tag or DescriptorTag(buffer, start)
+		self._assert_tag_identifier(TagIdentifier.TerminatingDescriptor)
+
 	# FIXME: Add the rest
 
 
 # page 3/21 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 class Type1PartitionMap(BaseTag):
+	__slots__ = ('partition_map_type', 'partition_map_length', 'volume_sequence_number', 'partition_number')
+
 	def __init__(self, buffer, start):
 		super(Type1PartitionMap, self).__init__(6, buffer, start)
 
-		self.partition_map_type = to_uint8(buffer, start + 0)
-		self.partition_map_length = to_uint8(buffer, start + 1)
-		self.volume_sequence_number = to_uint16(buffer, start + 2)
-		self.partition_number = to_uint16(buffer, start + 4)
+		(self.partition_map_type,
+		self.partition_map_length,
+		self.volume_sequence_number,
+		self.partition_number) = _TYPE1_PARTITION_MAP.unpack_from(buffer, start)
 
 		if not self.partition_map_type == 1:
-			raise Exception("Type 1 Partition Map Type was {0} instead of 1.".format(self.partition_map_type))
+			raise UdfFormatError("Type 1 Partition Map Type was {0} instead of 1.", self.partition_map_type)
 
 		if not self.partition_map_length == self.size:
-			raise Exception("Type 1 Partition Map Length was {0} instead of {1}.".format(self.partition_map_length, self.size))
+			raise UdfFormatError("Type 1 Partition Map Length was {0} instead of {1}.", self.partition_map_length, self.size)
 
 
 # page 3/22 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
@@ -487,41 +755,44 @@ class Type2PartitionMap(BaseTag):
 		self.partition_type_identifier = EntityID(EntityIdType.UDFIdentifier, start + 4, start + 32)
 
 		if not self.partition_map_type == 2:
-			raise Exception("Type 2 Partition Map Type was {0} instead of 2.".format(self.partition_map_type))
+			raise UdfFormatError("Type 2 Partition Map Type was {0} instead of 2.", self.partition_map_type)
 
 		if not self.partition_map_length == self.size:
-			raise Exception("Type 2 Partition Map Length was {0} instead of {1}.".format(self.partition_map_length, self.size))
+			raise UdfFormatError("Type 2 Partition Map Length was {0} instead of {1}.", self.partition_map_length, self.size)
 
 
 # page 4/28 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 # page 56 of http://www.osta.org/specs/pdf/udf260.pdf
 class FileEntry(BaseTag):
-	def __init__(self, buffer, start = 0):
+	def __init__(self, buffer, start = 0, descriptor_tag = None):
 		super(FileEntry, self).__init__(300, buffer, start) # FIXME: How do we deal with this having a dynamic size?
 
-		self.descriptor_tag = DescriptorTag(buffer, start)
+		# Use the Descriptor Tag if it was already parsed
+		self.descriptor_tag = descriptor_tag or DescriptorTag(buffer, start)
 		self._assert_tag_identifier(TagIdentifier.FileEntry)
 
+		(self.uid,
+		self.gid,
+		self.permissions,
+		self.file_link_count,
+		self.record_format,
+		self.record_display_attributes,
+		self.record_length,
+		self.information_length,
+		self.logical_blocks_recorded,
+		self.checkpoint,
+		self.uinque_id,
+		self.length_of_extended_attributes) = _FE_FIELDS.unpack_from(buffer, start + 36)
+
+		mv = memoryview(buffer)
 		self.icb_tag = ICBTag(buffer, start + 16)
-		self.uid = to_uint32(buffer, start + 36)
-		self.gid = to_uint32(buffer, start + 40)
-		self.permissions = to_uint32(buffer, start + 44)
-		self.file_link_count = to_uint16(buffer, start + 48)
-		self.record_format = to_uint8(buffer, start + 50)
-		self.record_display_attributes = to_uint8(buffer, start + 51)
-		self.record_length = to_uint32(buffer, start + 52)
-		self.information_length = to_uint64(buffer, start + 56)
-		self.logical_blocks_recorded = to_uint64(buffer, start + 64)
-		self.access_date_and_time = buffer[start + 72 : start + 84] # FIXME: timestamp
-		self.modification_date_and_time = buffer[start + 84 : start + 96] # FIXME: timestamp
-		self.attribute_date_and_time = buffer[start + 96 : start + 108] # FIXME: timestamp
-		self.checkpoint = to_uint32(buffer, start + 108)
+		self.access_date_and_time = mv[start + 72 : start + 84] # FIXME: timestamp
+		self.modification_date_and_time = mv[start + 84 : start + 96] # FIXME: timestamp
+		self.attribute_date_and_time = mv[start + 96 : start + 108] # FIXME: timestamp
 		self.extended_attribute_icb = LongAllocationDescriptor(buffer, start + 112)
 		self.implementation_identifier = EntityID(EntityIdType.ImplementationIdentifier, buffer, start + 128)
-		self.uinque_id = to_uint64(buffer, start + 160)
-		self.length_of_extended_attributes = to_uint32(buffer, start + 168)
 		self.length_of_allocation_descriptors = to_uint32(buffer, start + 173)
-		self.extended_attributes = buffer[start + 176 : start + 176 + self.length_of_extended_attributes]
+		self.extended_attributes = mv[start + 176 : start + 176 + self.length_of_extended_attributes]
 		self.allocation_descriptors = buffer[start + 176 + self.length_of_extended_attributes : start + 176 + self.length_of_extended_attributes + self.length_of_allocation_descriptors]
 
 
@@ -546,6 +817,8 @@ class FileType(object): # enum
 # page 4/23 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 # "2.3.5 ICB Tag" of http://www.osta.org/specs/pdf/udf260.pdf
 class ICBTag(BaseTag):
+	__slots__ = ('prior_recorded_number_of_direct_entries', 'strategy_type', 'strategy_parameter', 'maximum_number_of_entries', 'reserved', 'file_type', 'parent_icb_location', 'allocation_type', 'flags')
+
 	def __init__(self, buffer, start = 0):
 		super(ICBTag, self).__init__(20, buffer, start)
 
@@ -572,10 +845,11 @@ class CookedExtent(object):
 
 
 class ShortAllocationDescriptor(BaseTag):
+	__slots__ = ('extent_location', 'extent_length', 'flags')
+
 	def __init__(self, buffer, start = 0):
 		super(ShortAllocationDescriptor, self).__init__(8, buffer, start)
-		length = to_uint32(buffer, start)
-		self.extent_location = to_uint32(buffer, start + 4)
+		length, self.extent_location = _EXTENT_AD.unpack_from(buffer, start)
 		self.extent_length = length & 0x3FFFFFFF
 		self.flags = (length >> 30) & 0x3
 
@@ -659,8 +933,7 @@ class FileContentBuffer(object):
 				part = self.partition
 
 			new_pos = extent.start_pos + extent_offset + part.physical_partition._start
-			part.physical_partition._file.seek(new_pos)
-			buffer = part.physical_partition._file.read(to_read)
+			buffer = read_at(part.physical_partition._file, new_pos, to_read)
 			if len(buffer) == 0:
 				return buffer
 
@@ -691,7 +964,7 @@ class File(object):
 
 		dt = DescriptorTag(root_data_dir)
 		if dt.tag_identifier == TagIdentifier.FileEntry:
-			file_entry = FileEntry(root_data_dir)
+			file_entry = FileEntry(root_data_dir, descriptor_tag = dt)
 			if file_entry.icb_tag.file_type == FileType.directory:
 				return Directory(context, partition, file_entry)
 			else:
@@ -718,19 +991,23 @@ class FileCharacteristic(object): # enum
 
 # page 4/21 of http://www.ecma-international.org/publications/files/ECMA-ST/Ecma-167.pdf
 class FileIdentifierDescriptor(BaseTag):
-	def __init__(self, buffer, start = 0):
+	__slots__ = ('rounded_size', 'descriptor_tag', 'file_version_number', 'file_characteristics', 'length_of_file_identifier', 'ICB', 'length_of_implementation_use', 'implementation_use', 'file_identifier')
+
+	def __init__(self, buffer, start = 0, descriptor_tag = None):
 		super(FileIdentifierDescriptor, self).__init__(0, buffer, start)
 
 		self.rounded_size = 0
 
-		self.descriptor_tag = DescriptorTag(buffer, start)
+		# Use the Descriptor Tag if it was already parsed
+		self.descriptor_tag = descriptor_tag or DescriptorTag(buffer, start)
 		self._assert_tag_identifier(TagIdentifier.FileIdentifierDescriptor)
 
-		self.file_version_number = to_uint16(buffer, start + 16)
-		self.file_characteristics = to_uint8(buffer, start + 18)
-		self.length_of_file_identifier = to_uint8(buffer, start + 19)
+		(self.file_version_number,
+		self.file_characteristics,
+		self.length_of_file_identifier,
+		self.length_of_implementation_use) = _FID_FIELDS.unpack_from(buffer, start + 16)
+
 		self.ICB = LongAllocationDescriptor(buffer, start + 20)
-		self.length_of_implementation_use = to_uint16(buffer, start + 36)
 		self.implementation_use = buffer[start + 38 : start + 38 + self.length_of_implementation_use]
 
 		s = start + 38 + self.length_of_implementation_use
@@ -768,51 +1045,50 @@ def read_extent(context, extent):
 	offset = partition.physical_partition._start
 	pos = extent.extent_location.logical_block_number * partition.logical_block_size
 	length = extent.extent_length
-	context.file.seek(offset + pos)
-	retval = context.file.read(length)
+	retval = read_at(context.file, offset + pos, length)
 	return retval
 
 
 # FIXME: This assumes the sector size is 2048
 def is_valid_udf(file, file_size):
-	# Move to the start of the file
-	file.seek(0)
-
 	# Make sure there is enough space for a header and sector
 	if file_size < HEADER_SIZE + SECTOR_SIZE:
 		return False
 
-	# Move past 32K of empty space
-	file.seek(HEADER_SIZE)
+	# Start past 32K of empty space
+	offset = HEADER_SIZE
 
 	is_valid = True
 	has_bea, has_vsd, has_tea = False, False, False
 
 	# Look at each sector
 	while(is_valid):
-		# Read the next sector
-		buffer = file.read(SECTOR_SIZE)
-		if len(buffer) < SECTOR_SIZE:
+		# Stop if there is not a whole sector left
+		if offset + SECTOR_SIZE > file_size:
 			break
 
-		# Get the sector meta data
-		structure_type = to_uint8(buffer, 0)
-		standard_identifier = buffer[1 : 6]
-		structure_version = to_uint8(buffer, 6)
+		# Read just the standard identifier of the sector
+		# (the structure type and version at bytes 0 and 6 are not used)
+		standard_identifier = read_at(file, offset + 1, 5)
+		offset += SECTOR_SIZE
 
 		# Check if we have the beginning, middle, or end
-		if standard_identifier in [b'BEA01']:
+		if standard_identifier == b'BEA01':
 			has_bea = True
-		elif standard_identifier in [b'NSR02', b'NSR03']:
+		elif standard_identifier in _VSD_IDENTIFIERS:
 			has_vsd = True
-		elif standard_identifier in [b'TEA01']:
+		elif standard_identifier == b'TEA01':
 			has_tea = True
-		elif standard_identifier in [b'BOOT2', b'CD001', b'CDW02']:
+		elif standard_identifier in _OTHER_VRS_IDENTIFIERS:
 			pass
 		else:
 			is_valid = False
 
-	return has_bea and has_vsd and has_tea
+		# Stop once the whole sequence has been found
+		if has_bea and has_vsd and has_tea:
+			return True
+
+	return False
 
 
 def get_sector_size(file, file_size):
@@ -822,30 +1098,52 @@ def get_sector_size(file, file_size):
 		if file_size < 257 * size:
 			continue
 
-		# Move to the last sector
-		file.seek(256 * size)
+		# Read the Descriptor Tag from the last sector
+		buffer = read_at(file, 256 * size, 16)
+		if len(buffer) < 16:
+			continue
 
-		# Read the Descriptor Tag
-		buffer = file.read(16)
-		tag = None
-		try:
-			tag = DescriptorTag(buffer)
-		# Skip if the tag is not valid
-		except:
+		# Skip if the sector is not an Anchor Volume Descriptor Pointer
+		if not DescriptorTag.peek_tag_identifier(buffer) == TagIdentifier.AnchorVolumeDescriptorPointer:
 			continue
 
 		# Skip if the tag thinks it is at the wrong sector
-		if not tag.tag_location == 256:
+		if not to_uint32(buffer, 12) == 256:
 			continue
 
-		# Skip if the sector is not an Anchor Volume Description Pointer
-		if not tag.tag_identifier == TagIdentifier.AnchorVolumeDescriptorPointer:
+		# Skip if the tag is not valid
+		if not DescriptorTag.try_parse(buffer):
 			continue
 
 		# Got the correct size
 		return size
 
-	raise Exception("Could not get file sector size.")
+	raise UdfFormatError("Could not get file sector size.")
+
+
+# The Volume Descriptors that are parsed, by Tag Identifier
+_VOLUME_DESCRIPTOR_TYPES = {
+	TagIdentifier.PrimaryVolumeDescriptor : PrimaryVolumeDescriptor,
+	TagIdentifier.AnchorVolumeDescriptorPointer : AnchorVolumeDescriptorPointer,
+	TagIdentifier.PartitionDescriptor : PartitionDescriptor,
+	TagIdentifier.LogicalVolumeDescriptor : LogicalVolumeDescriptor,
+	TagIdentifier.TerminatingDescriptor : TerminatingDescriptor,
+}
+
+# The Volume Descriptors that are known, but not parsed yet
+_UNUSED_VOLUME_DESCRIPTOR_TAGS = frozenset([
+	TagIdentifier.VolumeDescriptorPointer,
+	TagIdentifier.ImplementationUseVolumeDescriptor,
+	TagIdentifier.UnallocatedSpaceDescriptor,
+	TagIdentifier.LogicalVolumeIntegrityDescriptor,
+])
+
+# The Volume Descriptors that are needed to read the file system
+_REQUIRED_VOLUME_DESCRIPTOR_TAGS = (
+	TagIdentifier.PartitionDescriptor,
+	TagIdentifier.LogicalVolumeDescriptor,
+	TagIdentifier.TerminatingDescriptor,
+)
 
 
 def read_udf_file(file_name):
@@ -855,88 +1153,85 @@ def read_udf_file(file_name):
 
 	# Open the file
 	file_size = os.path.getsize(file_name)
-	file = open(file_name, 'rb')
+	file = map_file(open(file_name, 'rb'), file_size)
+
+	return read_udf(file, file_size, file_name)
 
+
+# Read the root directory from an open file, mmap or other file like object
+def read_udf(file, file_size, file_name = None):
 	# Make sure the file is valid UDF
 	if not is_valid_udf(file, file_size):
-		raise Exception("Is not a valid UDF file '{0}'".format(file_name))
+		raise UdfFormatError("Is not a valid UDF file '{0}'", file_name or file)
 
 	# Make sure the file can fit all the sectors
 	sector_size = get_sector_size(file, file_size)
 	if file_size < 257 * sector_size:
-		raise Exception("File is too small to hold all sectors '{0}'".format(file_name))
+		raise UdfFormatError("File is too small to hold all sectors '{0}'", file_name or file)
 
 	# "5.2 UDF Volume Structure and Mount Procedure" of https://sites.google.com/site/udfintro/
 	# Read the Anchor VD Pointer
 	context = UdfContext(file, sector_size)
 	sector = 256
-	file.seek(sector * sector_size)
-	buffer = file.read(512)
-	tag = DescriptorTag(buffer[0 : 16])
+	buffer = read_at(file, sector * sector_size, 512)
+	tag = DescriptorTag(buffer)
 	if not tag.tag_identifier == TagIdentifier.AnchorVolumeDescriptorPointer:
-		raise Exception("The last sector was supposed to be an Archive Volume Descriptor, but was not.")
-	avdp = AnchorVolumeDescriptorPointer(buffer)
+		raise UdfFormatError("The last sector was supposed to be an Archive Volume Descriptor, but was not.")
+	avdp = AnchorVolumeDescriptorPointer(buffer, descriptor_tag = tag)
 	
 	# Get the location of the primary volume descriptor
 	pvd_sector = avdp.main_volume_descriptor_sequence_extent.extent_location
-		
-	# Look through all the sectors and find the partition descriptor
-	logical_volume_descriptor = None
-	terminating_descriptor = None
+
+	# Read all the sectors from the primary volume descriptor to the last sector at once
+	sectors = read_at(file, pvd_sector * sector_size, max(257 - pvd_sector, 0) * sector_size)
+
+	# Look through all the sectors and find the volume descriptors
+	descriptors = {}
 	for sector in range(pvd_sector, 257):
-		# Move to the sector start
-		file.seek(sector * sector_size)
+		# Get the sector start
+		offset = (sector - pvd_sector) * sector_size
 
-		# Read the Descriptor Tag
-		buffer = file.read(16)
-		tag = None
-		try:
-			tag = DescriptorTag(buffer)
-		# Skip if not valid
-		except:
+		# Skip if there is no tag
+		if DescriptorTag.peek_tag_identifier(sectors, offset) == TagIdentifier.unknown:
 			continue
 
-		# Move back to the start of the sector
-		file.seek(sector * sector_size)
-		buffer = file.read(512)
-
-		if tag.tag_identifier == TagIdentifier.PrimaryVolumeDescriptor:
-			desc = PrimaryVolumeDescriptor(buffer)
-		elif tag.tag_identifier == TagIdentifier.AnchorVolumeDescriptorPointer:
-			anchor = AnchorVolumeDescriptorPointer(buffer)
-		elif tag.tag_identifier == TagIdentifier.VolumeDescriptorPointer:
-			pass #VolumeDescriptorPointer(buffer)
-		elif tag.tag_identifier == TagIdentifier.ImplementationUseVolumeDescriptor:
-			pass #ImplementationUseVolumeDescriptor(buffer)
-		elif tag.tag_identifier == TagIdentifier.PartitionDescriptor:
-			partition_descriptor = PartitionDescriptor(buffer)
-			start = partition_descriptor.partition_starting_location * sector_size
-			length = partition_descriptor.partition_length * sector_size
-			physical_partition = PhysicalPartition(file, start, length)
-			context.physical_partitions[partition_descriptor.partition_number] = physical_partition
-		elif tag.tag_identifier == TagIdentifier.LogicalVolumeDescriptor:
-			logical_volume_descriptor = LogicalVolumeDescriptor(buffer)
-		elif tag.tag_identifier == TagIdentifier.UnallocatedSpaceDescriptor:
-			pass #UnallocatedSpaceDescriptor(buffer)
-		elif tag.tag_identifier == TagIdentifier.TerminatingDescriptor:
-			terminating_descriptor = TerminatingDescriptor(buffer)
-		elif tag.tag_identifier == TagIdentifier.LogicalVolumeIntegrityDescriptor:
-			pass #LogicalVolumeIntegrityDescriptor(buffer)
-		elif tag.tag_identifier != 0:
+		# Read the Descriptor Tag, and skip if it is not valid
+		tag = DescriptorTag.try_parse(sectors, offset)
+		if not tag:
+			continue
+
+		# Skip if the descriptor is known, but not used yet
+		if tag.tag_identifier in _UNUSED_VOLUME_DESCRIPTOR_TAGS:
+			continue
+
+		# Get the descriptor, or fail if it is not one we know
+		descriptor_type = _VOLUME_DESCRIPTOR_TYPES.get(tag.tag_identifier)
+		if not descriptor_type:
 			raise NotImplementedError("Unexpected Descriptor Tag :{0}".format(tag.tag_identifier))
+		# Give the descriptor only its own sector, so it does not keep all the sectors alive
+		descriptor = descriptor_type(sectors[offset : offset + 512], descriptor_tag = tag)
+		descriptors[tag.tag_identifier] = descriptor
+
+		# Save the physical partition of each partition descriptor
+		if tag.tag_identifier == TagIdentifier.PartitionDescriptor:
+			start = descriptor.partition_starting_location * sector_size
+			length = descriptor.partition_length * sector_size
+			physical_partition = PhysicalPartition(file, start, length)
+			context.physical_partitions[descriptor.partition_number] = physical_partition
 
-		if logical_volume_descriptor and partition_descriptor and terminating_descriptor:
+		if all(t in descriptors for t in _REQUIRED_VOLUME_DESCRIPTOR_TAGS):
 			break
 
 	# Make sure we have all the segments we need
+	logical_volume_descriptor = descriptors.get(TagIdentifier.LogicalVolumeDescriptor)
 	if not logical_volume_descriptor:
-		raise Exception("File is missing a Logical Volume Descriptor sector.")
+		raise UdfFormatError("File is missing a Logical Volume Descriptor sector.")
 
-	if not partition_descriptor:
-		raise Exception("File is missing a Partition Descriptor sector.")
+	if not TagIdentifier.PartitionDescriptor in descriptors:
+		raise UdfFormatError("File is missing a Partition Descriptor sector.")
 
-	if not terminating_descriptor:
-		raise Exception("File is missing a Terminating Descriptor sector.")
+	if not TagIdentifier.TerminatingDescriptor in descriptors:
+		raise UdfFormatError("File is missing a Terminating Descriptor sector.")
 
 	# Get all the logical partitions
 	for i in range(len(logical_volume_descriptor.partition_maps)):
@@ -948,11 +1243,11 @@ def read_udf_file(file_name):
 	tag = None
 	try:
 		tag = DescriptorTag(fsd_buffer)
-	except:
-		raise Exception("Failed to get Descriptor Tag from Partition Extent.")
+	except UdfFormatError:
+		raise UdfFormatError("Failed to get Descriptor Tag from Partition Extent.")
 
 	# Get the root file information from the extent
-	file_set_descriptor = FileSetDescriptor(fsd_buffer)
+	file_set_descriptor = FileSetDescriptor(fsd_buffer, descriptor_tag = tag)
 	root_directory = File.from_descriptor(context, file_set_descriptor.root_directory_icb)
 	return root_directory
 
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+# Tests for read_udf, using a small UDF image that is built in memory
+# Run with: python -m unittest test_read_udf
+
+
+import io, os
+import mmap
+import pickle
+import struct
+import tempfile
+import unittest
+
+import read_udf
+
+
+SECTOR_SIZE = 2048
+PARTITION_START = 300
+FILE_NAMES = [b'FOO.TXT', b'BAR.BIN', b'sub']
+
+
+# Write a Descriptor Tag at the start of the buffer, with a valid checksum
+def write_tag(buffer, tag_identifier, tag_location):
+	struct.pack_into('<HHBBHHHI', buffer, 0, tag_identifier, 2, 0, 0, 1, 0, 0, tag_location)
+	buffer[4] = read_udf.tag_checksum(bytes(buffer[0 : 16]))
+
+def make_descriptor(tag_identifier, tag_location):
+	buffer = bytearray(512)
+	write_tag(buffer, tag_identifier, tag_location)
+	return buffer
+
+def make_file_identifier(name, file_characteristics, logical_block_number):
+	length_of_file_identifier = len(name) + 1 if name else 0
+	buffer = bytearray(read_udf.round_up(38 + length_of_file_identifier, 4))
+	struct.pack_into('<HBB', buffer, 16, 1, file_characteristics, length_of_file_identifier)
+	struct.pack_into('<IIH', buffer, 20, SECTOR_SIZE, logical_block_number, 0)
+	if name:
+		buffer[38] = 8
+		buffer[39 : 39 + len(name)] = name
+	write_tag(buffer, read_udf.TagIdentifier.FileIdentifierDescriptor, 2)
+	return bytes(buffer)
+
+def put(image, sector, buffer):
+	start = sector * SECTOR_SIZE
+	image[start : start + len(buffer)] = buffer
+
+# Build an image with one partition, and a root directory with a few files
+def make_udf_image():
+	image = bytearray(SECTOR_SIZE * 400)
+
+	# Volume Recognition Sequence
+	for i, identifier in enumerate([b'BEA01', b'NSR02', b'TEA01']):
+		put(image, 16 + i, b'\0' + identifier + b'\1')
+
+	# Anchor Volume Descriptor Pointer, pointing at the Volume Descriptor Sequence
+	avdp = make_descriptor(read_udf.TagIdentifier.AnchorVolumeDescriptorPointer, 256)
+	struct.pack_into('<IIII', avdp, 16, 16 * SECTOR_SIZE, 32, 16 * SECTOR_SIZE, 48)
+	put(image, 256, avdp)
+
+	# Volume Descriptor Sequence
+	put(image, 32, make_descriptor(read_udf.TagIdentifier.PrimaryVolumeDescriptor, 32))
+
+	pd = make_descriptor(read_udf.TagIdentifier.PartitionDescriptor, 33)
+	struct.pack_into('<HH', pd, 20, 1, 0)
+	struct.pack_into('<III', pd, 184, 1, PARTITION_START, 100)
+	put(image, 33, pd)
+
+	lvd = make_descriptor(read_udf.TagIdentifier.LogicalVolumeDescriptor, 34)
+	struct.pack_into('<I', lvd, 212, SECTOR_SIZE)
+	lvd[217 : 217 + 19] = b'*OSTA UDF Compliant'
+	struct.pack_into('<IIH', lvd, 248, SECTOR_SIZE, 0, 0)
+	struct.pack_into('<II', lvd, 264, 6, 1)
+	struct.pack_into('<BBHH', lvd, 440, 1, 6, 1, 0)
+	put(image, 34, lvd)
+
+	put(image, 35, make_descriptor(read_udf.TagIdentifier.TerminatingDescriptor, 35))
+
+	# File Set Descriptor, with the root directory in logical block 1
+	fsd = make_descriptor(read_udf.TagIdentifier.FileSetDescriptor, 0)
+	struct.pack_into('<IIH', fsd, 400, SECTOR_SIZE, 1, 0)
+	put(image, PARTITION_START, fsd)
+
+	# The root directory entries, starting with the parent
+	entries = [make_file_identifier(None, read_udf.FileCharacteristic.parent | read_udf.FileCharacteristic.directory, 1)]
+	for i, name in enumerate(FILE_NAMES):
+		entries.append(make_file_identifier(name, 0, 3 + i))
+	directory = b''.join(entries)
+	put(image, PARTITION_START + 2, directory)
+
+	# Root File Entry, with one short allocation descriptor for the directory
+	fe = make_descriptor(read_udf.TagIdentifier.FileEntry, 1)
+	fe[16 + 11] = read_udf.FileType.directory
+	struct.pack_into('<Q', fe, 56, len(directory))
+	struct.pack_into('<II', fe, 168, 0, 8)
+	struct.pack_into('<II', fe, 176, len(directory), 2)
+	put(image, PARTITION_START + 1, fe)
+
+	return bytes(image)
+
+
+class TestReadUdf(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.image = make_udf_image()
+
+		fd, cls.file_name = tempfile.mkstemp(suffix = '.iso')
+		with os.fdopen(fd, 'wb') as f:
+			f.write(cls.image)
+
+	@classmethod
+	def tearDownClass(cls):
+		os.remove(cls.file_name)
+
+	def open_mapped(self):
+		file = read_udf.map_file(open(self.file_name, 'rb'), len(self.image))
+		self.addCleanup(file.close)
+		self.assertTrue(isinstance(file, mmap.mmap))
+		return file
+
+	def entry_names(self, directory):
+		return [entry.file_identifier for entry in directory.all_entries]
+
+	def test_is_valid_udf(self):
+		self.assertTrue(read_udf.is_valid_udf(self.open_mapped(), len(self.image)))
+		self.assertTrue(read_udf.is_valid_udf(io.BytesIO(self.image), len(self.image)))
+
+	def test_is_not_valid_udf(self):
+		image = b'\0' * len(self.image)
+		self.assertFalse(read_udf.is_valid_udf(io.BytesIO(image), len(image)))
+
+	def test_get_sector_size(self):
+		self.assertEqual(read_udf.get_sector_size(self.open_mapped(), len(self.image)), SECTOR_SIZE)
+		self.assertEqual(read_udf.get_sector_size(io.BytesIO(self.image), len(self.image)), SECTOR_SIZE)
+
+	def test_read_udf_file(self):
+		directory = read_udf.read_udf_file(self.file_name)
+		self.assertEqual(self.entry_names(directory), FILE_NAMES)
+
+	def test_read_udf_bytes_io(self):
+		directory = read_udf.read_udf(io.BytesIO(self.image), len(self.image))
+		self.assertEqual(self.entry_names(directory), FILE_NAMES)
+
+	def test_descriptor_tag_try_parse(self):
+		buffer = self.image[32 * SECTOR_SIZE : 33 * SECTOR_SIZE]
+		tag = read_udf.DescriptorTag(buffer)
+		parsed = read_udf.DescriptorTag.try_parse(buffer)
+		for name in read_udf.DescriptorTag.__slots__:
+			self.assertEqual(getattr(parsed, name), getattr(tag, name))
+
+		# An empty sector has no tag
+		self.assertEqual(read_udf.DescriptorTag.try_parse(b'\0' * 16), None)
+		self.assertRaises(read_udf.UdfFormatError, read_udf.DescriptorTag, b'\0' * 16)
+
+		# A bad checksum raises a checksum error
+		buffer = bytearray(buffer[0 : 16])
+		buffer[4] ^= 0xFF
+		self.assertEqual(read_udf.DescriptorTag.try_parse(bytes(buffer)), None)
+		self.assertRaises(read_udf.UdfChecksumError, read_udf.DescriptorTag, bytes(buffer))
+
+	def test_checksum_error_pickles(self):
+		error = pickle.loads(pickle.dumps(read_udf.UdfChecksumError(1, 2)))
+		self.assertEqual((error.checksum, error.expected_checksum), (1, 2))
+		self.assertEqual(str(error), "Checksum was 1, but 2 was expected")
+
+	def test_logical_volume_descriptor(self):
+		buffer = self.image[34 * SECTOR_SIZE : 34 * SECTOR_SIZE + 512]
+		lvd = read_udf.LogicalVolumeDescriptor(memoryview(buffer))
+		self.assertEqual(lvd.logical_block_size, SECTOR_SIZE)
+		self.assertTrue(lvd.partition_maps is lvd.partition_maps)
+		self.assertTrue(lvd.implementation_identifier is lvd.implementation_identifier)
+
+		# No partition maps are still only parsed once
+		buffer = bytearray(buffer)
+		struct.pack_into('<I', buffer, 268, 0)
+		lvd = read_udf.LogicalVolumeDescriptor(bytes(buffer))
+		self.assertEqual(lvd.partition_maps, [])
+		self.assertTrue(lvd.partition_maps is lvd.partition_maps)
+
+
+if __name__ == '__main__':
+	unittest.main()